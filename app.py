@@ -3,12 +3,58 @@
 import streamlit as st
 from pathlib import Path
 import tempfile
-import shutil
-import subprocess
-from keychain_maker.models import KeychainRequest
-from keychain_maker.templates import render_template, write_scad_and_font
-from keychain_maker.scad_renderer import render_stl, check_openscad_installed, get_openscad_path, get_openscad_version
+from typing import Optional
+from keychain_maker.pipeline import artifact_key, generate_keychain
+from keychain_maker.scad_renderer import get_openscad_path, get_openscad_version
 from keychain_maker.font_utils import suggest_font_name
+from keychain_maker.models import TessellationPolicy
+from keychain_maker.tessellation import tessellation_overrides, detect_text_size
+
+DEFAULT_FONT_NAME = "GG:style=Bartex-Regular"
+
+# Rendered artifacts kept per session; oldest entries are dropped beyond this
+MAX_SESSION_ARTIFACTS = 8
+
+EXAMPLE_TEMPLATES = {
+    "Basic (Original)": {
+        "file": "examples/barbie_keychain.scad",
+        "description": "Original template with pink base and white text overlay. Single color or basic multi-color."
+    },
+    "Multi-Color (2 layers)": {
+        "file": "examples/barbie_keychain_multicolor.scad",
+        "description": "**Optimized for multi-color printing!** Base: 2.5mm (Color 1), Text: 1.5mm (Color 2). Set color change at Z=2.5mm in your slicer."
+    },
+    "Configurable Heights": {
+        "file": "examples/keychain_configurable.scad",
+        "description": "Advanced template with customizable layer heights. Edit the .scad file to adjust Base_Layer_Height and Text_Layer_Height."
+    }
+}
+
+# Streamlit re-executes this script on every widget change. Anything that does
+# not depend on user input is cached for the lifetime of the server process.
+
+@st.cache_resource
+def get_toolchain_info() -> dict:
+    """Locate OpenSCAD and read its version once per process."""
+    path = get_openscad_path()
+    version = get_openscad_version(path) if path else None
+    return {"path": path, "version": version}
+
+@st.cache_data
+def load_example_template(path: str) -> Optional[bytes]:
+    """Read an example template from disk once per process."""
+    template_path = Path(path)
+    if not template_path.exists():
+        return None
+    return template_path.read_bytes()
+
+@st.cache_data
+def detect_font_name(font_bytes: bytes, font_filename: str) -> str:
+    """Suggest an OpenSCAD font name for an uploaded font, cached by content."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        font_path = Path(tmpdir) / font_filename
+        font_path.write_bytes(font_bytes)
+        return suggest_font_name(str(font_path))
 
 # Page configuration
 st.set_page_config(
@@ -17,6 +63,12 @@ st.set_page_config(
     layout="centered"
 )
 
+# Per-session store of finished renders, keyed by artifact_key()
+if "artifacts" not in st.session_state:
+    st.session_state.artifacts = {}
+if "current_artifact_key" not in st.session_state:
+    st.session_state.current_artifact_key = None
+
 # Title and description
 st.title("🔑 OpenSCAD Keychain Maker")
 st.markdown("""
@@ -39,14 +91,14 @@ with st.sidebar:
     - Use `{{TTF_FILE}}` for font file placeholder
     """)
     
-    # Check OpenSCAD installation
-    openscad_path = get_openscad_path()
+    # Check OpenSCAD installation (cached; see get_toolchain_info)
+    toolchain = get_toolchain_info()
+    openscad_path = toolchain["path"]
     
     if openscad_path:
         st.success("✅ OpenSCAD CLI detected")
-        version = get_openscad_version(openscad_path)
-        if version:
-            st.info(f"📍 {version}")
+        if toolchain["version"]:
+            st.info(f"📍 {toolchain['version']}")
         st.code(openscad_path, language="text")
     else:
         st.warning("⚠️ OpenSCAD CLI not found")
@@ -76,6 +128,10 @@ with st.sidebar:
             - `/usr/bin/openscad`
             - `/usr/local/bin/openscad`
             """)
+            
+            if st.button("🔄 Re-detect OpenSCAD"):
+                get_toolchain_info.clear()
+                st.rerun()
 
 # Main form
 st.header("Generate Keychain")
@@ -89,51 +145,33 @@ template_option = st.radio(
     horizontal=True
 )
 
-template_file = None
-template_description = ""
+template_bytes = None
+template_name = None
 
 if template_option == "Use Example Template":
-    example_templates = {
-        "Basic (Original)": {
-            "file": "examples/barbie_keychain.scad",
-            "description": "Original template with pink base and white text overlay. Single color or basic multi-color."
-        },
-        "Multi-Color (2 layers)": {
-            "file": "examples/barbie_keychain_multicolor.scad",
-            "description": "**Optimized for multi-color printing!** Base: 2.5mm (Color 1), Text: 1.5mm (Color 2). Set color change at Z=2.5mm in your slicer."
-        },
-        "Configurable Heights": {
-            "file": "examples/keychain_configurable.scad",
-            "description": "Advanced template with customizable layer heights. Edit the .scad file to adjust Base_Layer_Height and Text_Layer_Height."
-        }
-    }
-    
     selected_template = st.selectbox(
         "Select example template:",
-        list(example_templates.keys())
+        list(EXAMPLE_TEMPLATES.keys())
     )
     
-    template_info = example_templates[selected_template]
+    template_info = EXAMPLE_TEMPLATES[selected_template]
     st.info(f"ℹ️ {template_info['description']}")
     
-    # Read the example template file
-    from pathlib import Path
-    template_path = Path(template_info['file'])
-    if template_path.exists():
-        template_content = template_path.read_bytes()
-        # Create a file-like object
-        import io
-        template_file = io.BytesIO(template_content)
-        template_file.name = template_path.name
+    # Read the example template file (cached after the first run)
+    template_bytes = load_example_template(template_info['file'])
+    template_name = Path(template_info['file']).name
     
     if selected_template == "Multi-Color (2 layers)":
         st.success("🎨 **Multi-color printing ready!** See the Multi-Color Printing Guide below for slicer setup instructions.")
 else:
-    template_file = st.file_uploader(
+    uploaded_template = st.file_uploader(
         "Upload OpenSCAD Template (.scad)",
         type=["scad"],
         help="Upload a .scad file with {{TEXT}}, {{FONT_NAME}}, and {{TTF_FILE}} placeholders"
     )
+    if uploaded_template:
+        template_bytes = uploaded_template.getvalue()
+        template_name = uploaded_template.name
 
 st.subheader("🎨 Font")
 
@@ -143,6 +181,21 @@ font_file = st.file_uploader(
     help="Upload the font file you want to use for the keychain text"
 )
 
+font_bytes = font_file.getvalue() if font_file else None
+
+# The Font Name input is keyed so reruns keep what the user typed. A detected
+# name is only filled in while the field is empty or still holds the last
+# value filled in automatically.
+if "font_name" not in st.session_state:
+    st.session_state.font_name = DEFAULT_FONT_NAME
+    st.session_state.font_name_prefill = DEFAULT_FONT_NAME
+if font_file:
+    detected_font_name = detect_font_name(font_bytes, font_file.name)
+    st.caption(f"🔍 Detected font name: `{detected_font_name}`")
+    if st.session_state.font_name in ("", st.session_state.font_name_prefill):
+        st.session_state.font_name = detected_font_name
+        st.session_state.font_name_prefill = detected_font_name
+
 # Text inputs
 col1, col2 = st.columns(2)
 
@@ -157,7 +210,7 @@ with col1:
 with col2:
     font_name = st.text_input(
         "Font Name",
-        value="GG:style=Bartex-Regular",
+        key="font_name",
         help="OpenSCAD font identifier (e.g., 'GG:style=Bartex-Regular')"
     )
 
@@ -170,15 +223,40 @@ output_basename = st.text_input(
 # Render options
 render_stl_option = st.checkbox(
     "Generate STL file",
-    value=check_openscad_installed(),
-    disabled=not check_openscad_installed(),
+    value=openscad_path is not None,
+    disabled=openscad_path is None,
     help="Render an STL file using OpenSCAD CLI (requires OpenSCAD to be installed)"
 )
 
+tessellation = None
+if render_stl_option:
+    adaptive_option = st.checkbox(
+        "Adaptive tessellation",
+        value=True,
+        help="Size curve resolution (text, outline and ring segments) to the text size and your nozzle, instead of the template's fixed values"
+    )
+    if adaptive_option:
+        nozzle_width = st.number_input(
+            "Nozzle width (mm)",
+            min_value=0.1,
+            max_value=1.2,
+            value=0.4,
+            step=0.05,
+            help="Curves are not subdivided below what this nozzle can print"
+        )
+        tessellation = TessellationPolicy(nozzle_width=nozzle_width)
+        if template_bytes:
+            text_size = detect_text_size(template_bytes.decode("utf-8", errors="replace"))
+            overrides = tessellation_overrides(tessellation, text_size)
+            st.caption(
+                f"📐 Text_Size {text_size:g}: text $fn={overrides['text_fn']}, outline $fn={overrides['offset_fn']}, "
+                f"ring segments={overrides['cyl_segments']} (applied to the STL render only)"
+            )
+
 # Generate button
 if st.button("🚀 Generate Keychain", type="primary", use_container_width=True):
     # Validation
-    if not template_file:
+    if not template_bytes:
         st.error("❌ Please upload a template SCAD file")
     elif not font_file:
         st.error("❌ Please upload a font file")
@@ -187,105 +265,105 @@ if st.button("🚀 Generate Keychain", type="primary", use_container_width=True)
     elif not output_basename:
         st.error("❌ Please enter an output file name")
     else:
-        try:
-            with st.spinner("Generating files..."):
-                # Create temporary directory for processing
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    tmpdir_path = Path(tmpdir)
-                    
-                    # Save uploaded files to temp directory
-                    template_path = tmpdir_path / template_file.name
-                    font_path = tmpdir_path / font_file.name
-                    
-                    # Reset file pointers in case they were read before
-                    template_file.seek(0)
-                    font_file.seek(0)
-                    
-                    template_path.write_bytes(template_file.read())
-                    font_path.write_bytes(font_file.read())
-                    
-                    # Create output directory
-                    output_dir = tmpdir_path / "dist"
-                    output_dir.mkdir(exist_ok=True)
-                    
-                    # Create request object
-                    req = KeychainRequest(
-                        template_scad=template_path,
-                        font_file=font_path,
+        key = artifact_key(
+            template_bytes=template_bytes,
+            font_bytes=font_bytes,
+            text=keychain_text,
+            font_name=font_name,
+            output_basename=output_basename,
+            render_stl_file=render_stl_option,
+            tessellation=tessellation
+        )
+        artifacts_store = st.session_state.artifacts
+        
+        cached = artifacts_store.get(key)
+        
+        # Failed STL renders are never reused, so Generate always retries them
+        if cached is not None and cached.stl_error is None:
+            st.info("♻️ Inputs unchanged - reusing the previous render.")
+            st.session_state.current_artifact_key = key
+        else:
+            try:
+                with st.spinner("Generating files..."):
+                    artifacts = generate_keychain(
+                        template_bytes=template_bytes,
+                        template_name=template_name,
+                        font_bytes=font_bytes,
+                        font_filename=font_file.name,
                         text=keychain_text,
                         font_name=font_name,
-                        output_basename=output_basename
+                        output_basename=output_basename,
+                        render_stl_file=render_stl_option,
+                        openscad_path=openscad_path,
+                        tessellation=tessellation
                     )
-                    
-                    # Render template
-                    rendered = render_template(req)
-                    
-                    # Define output paths in temp directory
-                    scad_output_path = output_dir / f"{output_basename}.scad"
-                    scad_output_path.write_text(rendered, encoding="utf-8")
-                    
-                    # Copy font file to output directory
-                    dest_font_path = output_dir / font_path.name
-                    shutil.copy2(font_path, dest_font_path)
-                    
-                    st.success("✅ SCAD file generated successfully!")
-                    
-                    # Render STL if requested
-                    stl_output_path = None
-                    if render_stl_option:
-                        try:
-                            with st.spinner("Rendering STL file..."):
-                                # Define STL output path
-                                stl_output_path = output_dir / f"{output_basename}.stl"
-                                
-                                # Render STL using detected OpenSCAD path
-                                render_stl(
-                                    scad_file_path=str(scad_output_path),
-                                    stl_file_path=str(stl_output_path),
-                                    openscad_path=openscad_path
-                                )
-                                
-                                st.success("✅ STL file rendered successfully!")
-                        except subprocess.CalledProcessError as e:
-                            st.error(f"❌ STL rendering failed: {e.stderr}")
-                        except Exception as e:
-                            st.error(f"❌ STL rendering error: {str(e)}")
-                    
-                    # Download section
-                    st.header("📥 Download Files")
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Download SCAD file
-                        with open(scad_output_path, "rb") as f:
-                            st.download_button(
-                                label="⬇️ Download SCAD",
-                                data=f.read(),
-                                file_name=f"{output_basename}.scad",
-                                mime="text/plain",
-                                use_container_width=True
-                            )
-                    
-                    with col2:
-                        # Download STL file if it exists
-                        if stl_output_path and stl_output_path.exists():
-                            with open(stl_output_path, "rb") as f:
-                                st.download_button(
-                                    label="⬇️ Download STL",
-                                    data=f.read(),
-                                    file_name=f"{output_basename}.stl",
-                                    mime="application/octet-stream",
-                                    use_container_width=True
-                                )
-                    
-                    # Preview SCAD content
-                    with st.expander("👁️ Preview Generated SCAD"):
-                        st.code(rendered, language="openscad")
-                        
-        except Exception as e:
-            st.error(f"❌ An error occurred: {str(e)}")
-            st.exception(e)
+                
+                artifacts_store.pop(key, None)
+                artifacts_store[key] = artifacts
+                while len(artifacts_store) > MAX_SESSION_ARTIFACTS:
+                    artifacts_store.pop(next(iter(artifacts_store)))
+                st.session_state.current_artifact_key = key
+                
+                st.success("✅ SCAD file generated successfully!")
+                if artifacts.stl is not None:
+                    st.success("✅ STL file rendered successfully!")
+            except Exception as e:
+                st.error(f"❌ An error occurred: {str(e)}")
+                st.exception(e)
+
+# Results persist in session state, so downloads survive later reruns
+current = st.session_state.artifacts.get(st.session_state.current_artifact_key)
+if current is not None:
+    if current.stl_error:
+        st.error(f"❌ {current.stl_error}")
+    
+    # Download section
+    st.header("📥 Download Files")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Download SCAD file
+        st.download_button(
+            label="⬇️ Download SCAD",
+            data=current.scad.encode("utf-8"),
+            file_name=f"{current.output_basename}.scad",
+            mime="text/plain",
+            use_container_width=True
+        )
+    
+    with col2:
+        # Download STL file if it was rendered
+        if current.stl is not None:
+            st.download_button(
+                label="⬇️ Download STL",
+                data=current.stl,
+                file_name=f"{current.output_basename}.stl",
+                mime="application/octet-stream",
+                use_container_width=True
+            )
+    
+    # Preview SCAD content
+    with st.expander("👁️ Preview Generated SCAD"):
+        st.code(current.scad, language="openscad")
+    
+    # OpenSCAD timings and mesh statistics for the STL render
+    if current.profile is not None:
+        with st.expander("⏱️ Render Profile"):
+            profile = current.profile
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total time", f"{profile.wall_time:.2f}s")
+            if profile.geometry_time is not None:
+                col2.metric("Geometry time", f"{profile.geometry_time:.2f}s")
+            if profile.facets is not None:
+                col3.metric("Facets", f"{profile.facets:,}")
+            st.json(profile.model_dump(exclude={"output"}))
+            st.download_button(
+                label="⬇️ Download Profile (JSON)",
+                data=profile.model_dump_json(indent=2),
+                file_name=f"{current.output_basename}.profile.json",
+                mime="application/json"
+            )
 
 # Multi-color printing guide
 st.markdown("---")
@@ -0,0 +1,708 @@
+# keychain_maker/distributed.py
+
+"""
+Coordinator/worker mode for spreading batch renders across several hosts.
+
+The coordinator holds a queue of RenderJob entries and a content-addressed font
+store, and serves them over plain HTTP. Workers lease one job at a time, fetch
+the job's font once by hash, render it with generate_keychain(), and post the
+result back. A lease stays valid only while the worker keeps sending
+heartbeats; when it lapses the job is put back on the queue for another worker.
+
+Everything can run on one machine:
+
+    python -m keychain_maker.distributed coordinator --port 8765
+    python -m keychain_maker.distributed worker --coordinator http://127.0.0.1:8765
+    python -m keychain_maker.distributed worker --coordinator http://127.0.0.1:8765
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Set
+from .models import KeychainArtifacts, RenderJob
+from .pipeline import generate_keychain
+
+# Job states
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 30.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RESULT_TTL = 3600.0
+
+def font_hash(font_bytes: bytes) -> str:
+    """Content hash used to identify fonts between coordinator and workers."""
+    return hashlib.sha256(font_bytes).hexdigest()
+
+class _JobRecord:
+    """Coordinator-side bookkeeping for one job."""
+    
+    def __init__(self, job_id: str, job: RenderJob):
+        self.job_id = job_id
+        self.job = job
+        self.state = QUEUED
+        self.worker_id: Optional[str] = None
+        self.lease_expires = 0.0
+        self.attempts = 0
+        self.result: Optional[KeychainArtifacts] = None
+        self.error: Optional[str] = None
+        self.finished_at = 0.0
+    
+    def status(self) -> dict:
+        status = {
+            "job_id": self.job_id,
+            "state": self.state,
+            "worker_id": self.worker_id,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+        if self.result is not None:
+            status["result"] = _artifacts_to_json(self.result)
+        return status
+
+def _artifacts_to_json(artifacts: KeychainArtifacts) -> dict:
+    data = artifacts.model_dump(exclude={"stl"})
+    data["stl_b64"] = base64.b64encode(artifacts.stl).decode("ascii") if artifacts.stl is not None else None
+    return data
+
+def _artifacts_from_json(data: dict) -> KeychainArtifacts:
+    stl_b64 = data.pop("stl_b64", None)
+    return KeychainArtifacts(
+        **data,
+        stl=base64.b64decode(stl_b64) if stl_b64 is not None else None
+    )
+
+class Coordinator:
+    """
+    In-memory job queue with heartbeat-based leasing.
+    
+    Thread-safe; the HTTP handler calls into it from many request threads.
+    Finished jobs are kept until their result is discarded or `result_ttl`
+    seconds have passed, whichever comes first.
+    
+    Args:
+        lease_seconds: How long a lease stays valid without a heartbeat
+        max_attempts: Leases granted per job before it is marked failed
+        result_ttl: Seconds to keep a finished job's result
+        clock: Monotonic time source (overridable for testing)
+    """
+    
+    def __init__(
+        self,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fonts: Dict[str, bytes] = {}
+        self._jobs: Dict[str, _JobRecord] = {}
+        self._queue: deque = deque()
+        self._leased: Set[str] = set()
+        self._finished: deque = deque()  # (finished_at, job_id), oldest first
+        self._counts: Dict[str, int] = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+    
+    def add_font(self, font_bytes: bytes) -> str:
+        """Store a font and return its content hash."""
+        digest = font_hash(font_bytes)
+        with self._lock:
+            self._fonts.setdefault(digest, font_bytes)
+        return digest
+    
+    def get_font(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            return self._fonts.get(digest)
+    
+    def submit(self, job: RenderJob) -> str:
+        """
+        Queue a job for rendering.
+        
+        Raises:
+            KeyError: If the job's font has not been uploaded
+        """
+        with self._lock:
+            if job.font_hash not in self._fonts:
+                raise KeyError(f"Unknown font hash: {job.font_hash}")
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = _JobRecord(job_id, job)
+            self._counts[QUEUED] += 1
+            self._queue.append(job_id)
+        return job_id
+    
+    def lease(self, worker_id: str) -> Optional[dict]:
+        """Hand the next queued job to a worker, or return None if there is none."""
+        with self._lock:
+            self._expire()
+            while self._queue:
+                record = self._jobs.get(self._queue.popleft())
+                if record is None or record.state != QUEUED:
+                    continue
+                self._set_state(record, LEASED)
+                record.worker_id = worker_id
+                record.attempts += 1
+                record.lease_expires = self._clock() + self.lease_seconds
+                return {
+                    "job_id": record.job_id,
+                    "lease_seconds": self.lease_seconds,
+                    "job": record.job.model_dump(),
+                }
+            return None
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the worker no longer holds it."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if not self._holds_lease(record, worker_id):
+                return False
+            record.lease_expires = self._clock() + self.lease_seconds
+            return True
+    
+    def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        result: Optional[KeychainArtifacts] = None,
+        error: Optional[str] = None,
+        retry: bool = False,
+    ) -> bool:
+        """
+        Record a worker's outcome for a job.
+        
+        Results from a worker whose lease has lapsed are rejected, since the job
+        may already have been handed to someone else.
+        
+        Args:
+            job_id: Job being reported
+            worker_id: Worker holding the lease
+            result: Rendered artifacts on success
+            error: Failure description, if the job failed
+            retry: Requeue a failed job for another attempt (e.g. an OpenSCAD
+                problem on that worker) until max_attempts is reached
+        
+        Returns:
+            True if the result was accepted
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if not self._holds_lease(record, worker_id):
+                return False
+            if error and retry:
+                self._retry_or_fail(record, error)
+                return True
+            record.result = result
+            record.error = error
+            self._finish(record, FAILED if error else DONE)
+            return True
+    
+    def status(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            self._expire()
+            record = self._jobs.get(job_id)
+            return record.status() if record else None
+    
+    def discard(self, job_id: str) -> bool:
+        """
+        Drop a finished job and its result, e.g. once the submitter has fetched it.
+        
+        Returns:
+            True if the job existed and was finished
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None or record.state not in (DONE, FAILED):
+                return False
+            self._remove(record)
+            return True
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state (finished jobs only until discarded or expired)."""
+        with self._lock:
+            self._expire()
+            return dict(self._counts)
+    
+    def _holds_lease(self, record: Optional[_JobRecord], worker_id: str) -> bool:
+        return (
+            record is not None
+            and record.state == LEASED
+            and record.worker_id == worker_id
+            and record.lease_expires > self._clock()
+        )
+    
+    # The helpers below expect the caller to hold self._lock
+    
+    def _set_state(self, record: _JobRecord, state: str) -> None:
+        self._counts[record.state] -= 1
+        self._counts[state] += 1
+        if record.state == LEASED:
+            self._leased.discard(record.job_id)
+        if state == LEASED:
+            self._leased.add(record.job_id)
+        record.state = state
+    
+    def _finish(self, record: _JobRecord, state: str) -> None:
+        self._set_state(record, state)
+        record.finished_at = self._clock()
+        self._finished.append((record.finished_at, record.job_id))
+    
+    def _remove(self, record: _JobRecord) -> None:
+        self._counts[record.state] -= 1
+        self._leased.discard(record.job_id)
+        del self._jobs[record.job_id]
+    
+    def _retry_or_fail(self, record: _JobRecord, error: str) -> None:
+        record.worker_id = None
+        record.error = error
+        if record.attempts >= self.max_attempts:
+            record.error = f"{error} (gave up after {record.attempts} attempts)"
+            self._finish(record, FAILED)
+        else:
+            self._set_state(record, QUEUED)
+            self._queue.append(record.job_id)
+    
+    def _expire(self) -> None:
+        now = self._clock()
+        
+        # Only leased jobs can time out, so there is no need to scan the rest
+        for job_id in [j for j in self._leased if self._jobs[j].lease_expires <= now]:
+            self._retry_or_fail(self._jobs[job_id], "Lease expired")
+        
+        # Finished jobs are appended in completion order, so expired ones are at the front
+        while self._finished and self._finished[0][0] + self.result_ttl <= now:
+            finished_at, job_id = self._finished.popleft()
+            record = self._jobs.get(job_id)
+            if record is not None and record.finished_at == finished_at:
+                self._remove(record)
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end for a Coordinator.
+    
+    Routes:
+        POST /fonts                   raw font bytes -> {"font_hash"}
+        GET  /fonts/<hash>            raw font bytes
+        POST /jobs                    RenderJob JSON -> {"job_id"}
+        GET  /jobs/<id>               job status (and result when done)
+        DELETE /jobs/<id>             discard a finished job and its result
+        POST /lease                   {"worker_id"} -> job, or 204 if queue is empty
+        POST /jobs/<id>/heartbeat     {"worker_id"}
+        POST /jobs/<id>/complete      {"worker_id", "result" | "error", "retry"}
+        GET  /status                  job counts by state
+    """
+    
+    coordinator: Coordinator  # set on the subclass created by serve_coordinator()
+    
+    def log_message(self, format, *args):
+        # Keep worker polling from flooding the console
+        pass
+    
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts == ["status"]:
+            self._send_json(200, self.coordinator.counts())
+        elif len(parts) == 2 and parts[0] == "fonts":
+            font = self.coordinator.get_font(parts[1])
+            if font is None:
+                self._send_json(404, {"error": "unknown font"})
+            else:
+                self._send_bytes(200, font)
+        elif len(parts) == 2 and parts[0] == "jobs":
+            status = self.coordinator.status(parts[1])
+            if status is None:
+                self._send_json(404, {"error": "unknown job"})
+            else:
+                self._send_json(200, status)
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_DELETE(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "jobs":
+            ok = self.coordinator.discard(parts[1])
+            self._send_json(200 if ok else 409, {"ok": ok})
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length: {length}")
+            body = self.rfile.read(length)
+            
+            if parts == ["fonts"]:
+                self._send_json(200, {"font_hash": self.coordinator.add_font(body)})
+            elif parts == ["jobs"]:
+                job = RenderJob.model_validate_json(body)
+                self._send_json(200, {"job_id": self.coordinator.submit(job)})
+            elif parts == ["lease"]:
+                leased = self.coordinator.lease(json.loads(body)["worker_id"])
+                if leased is None:
+                    self._send_bytes(204, b"")
+                else:
+                    self._send_json(200, leased)
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "heartbeat":
+                ok = self.coordinator.heartbeat(parts[1], json.loads(body)["worker_id"])
+                self._send_json(200 if ok else 409, {"ok": ok})
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "complete":
+                data = json.loads(body)
+                result = data.get("result")
+                ok = self.coordinator.complete(
+                    parts[1],
+                    data["worker_id"],
+                    result=_artifacts_from_json(result) if result is not None else None,
+                    error=data.get("error"),
+                    retry=bool(data.get("retry", False))
+                )
+                self._send_json(200 if ok else 409, {"ok": ok})
+            else:
+                self._send_json(404, {"error": "not found"})
+        except (KeyError, TypeError, ValueError) as e:
+            # Malformed request: missing fields, wrong JSON shape, bad Content-Length
+            self.close_connection = True
+            self._send_json(400, {"error": str(e)})
+    
+    def _send_json(self, code: int, payload) -> None:
+        self._send_bytes(code, json.dumps(payload).encode("utf-8"), "application/json")
+    
+    def _send_bytes(self, code: int, data: bytes, content_type: str = "application/octet-stream") -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+def serve_coordinator(
+    coordinator: Coordinator,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for a coordinator.
+    
+    The caller runs it with serve_forever(), e.g. in a background thread.
+    Pass port=0 to pick a free port; the chosen one is in server.server_address.
+    """
+    handler = type("CoordinatorHandler", (_CoordinatorHandler,), {"coordinator": coordinator})
+    return ThreadingHTTPServer((host, port), handler)
+
+class CoordinatorClient:
+    """
+    Thin HTTP client for the coordinator, used by workers and job submitters.
+    
+    Args:
+        base_url: Coordinator address, e.g. "http://127.0.0.1:8765"
+        timeout: Per-request timeout in seconds
+    """
+    
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+    
+    def upload_font(self, font_bytes: bytes) -> str:
+        return self._request("POST", "/fonts", font_bytes)["font_hash"]
+    
+    def fetch_font(self, digest: str) -> bytes:
+        return self._request("GET", f"/fonts/{digest}", raw=True)
+    
+    def submit(self, job: RenderJob) -> str:
+        return self._request("POST", "/jobs", job.model_dump_json().encode("utf-8"))["job_id"]
+    
+    def status(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+    
+    def result(self, job_id: str) -> Optional[KeychainArtifacts]:
+        """Return the rendered artifacts for a finished job, or None if not done."""
+        status = self.status(job_id)
+        if status.get("result") is None:
+            return None
+        return _artifacts_from_json(status["result"])
+    
+    def discard(self, job_id: str) -> bool:
+        """Free a finished job's result on the coordinator."""
+        return self._request("DELETE", f"/jobs/{job_id}")["ok"]
+    
+    def wait(self, job_id: str, poll_interval: float = 0.5, timeout: Optional[float] = None) -> dict:
+        """
+        Poll until a job is done or failed.
+        
+        Raises:
+            TimeoutError: If the job does not finish within `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status["state"] in (DONE, FAILED):
+                return status
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+    
+    def lease(self, worker_id: str) -> Optional[dict]:
+        return self._request("POST", "/lease", self._worker_body(worker_id))
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return self._request("POST", f"/jobs/{job_id}/heartbeat", self._worker_body(worker_id))["ok"]
+    
+    def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        result: Optional[KeychainArtifacts] = None,
+        error: Optional[str] = None,
+        retry: bool = False,
+    ) -> bool:
+        body = {
+            "worker_id": worker_id,
+            "result": _artifacts_to_json(result) if result is not None else None,
+            "error": error,
+            "retry": retry,
+        }
+        return self._request("POST", f"/jobs/{job_id}/complete", json.dumps(body).encode("utf-8"))["ok"]
+    
+    @staticmethod
+    def _worker_body(worker_id: str) -> bytes:
+        return json.dumps({"worker_id": worker_id}).encode("utf-8")
+    
+    def _request(self, method: str, path: str, body: Optional[bytes] = None, raw: bool = False):
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                data = resp.read()
+                if resp.status == 204:
+                    return None
+        except urllib.error.HTTPError as e:
+            # 409 is a normal answer (lease lost); anything else is a real error
+            if e.code != 409:
+                raise
+            data = e.read()
+        return data if raw else json.loads(data)
+
+class Worker:
+    """
+    Pulls jobs from a coordinator and renders them locally.
+    
+    Fonts are cached in memory by content hash, so each distinct font is
+    downloaded once per worker process.
+    
+    Args:
+        client: Client for the coordinator
+        worker_id: Identifier reported to the coordinator (defaults to host + random suffix)
+        openscad_path: Optional custom path to OpenSCAD executable
+        poll_interval: Seconds to wait before polling again when the queue is empty
+    """
+    
+    def __init__(
+        self,
+        client: CoordinatorClient,
+        worker_id: Optional[str] = None,
+        openscad_path: Optional[str] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.client = client
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.openscad_path = openscad_path
+        self.poll_interval = poll_interval
+        self._fonts: Dict[str, bytes] = {}
+        self._stop = threading.Event()
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def run(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Process jobs until stopped, or until `max_jobs` have been handled.
+        
+        Returns:
+            Number of jobs processed
+        """
+        processed = 0
+        while not self._stop.is_set() and (max_jobs is None or processed < max_jobs):
+            try:
+                leased = self.client.lease(self.worker_id)
+            except OSError as e:
+                # Coordinator restarting or unreachable; keep polling
+                logger.warning("Lease request failed: %s", e)
+                self._stop.wait(self.poll_interval)
+                continue
+            if leased is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.process(leased)
+            processed += 1
+        return processed
+    
+    def process(self, leased: dict) -> bool:
+        """
+        Render one leased job, heartbeating until it finishes.
+        
+        Returns:
+            True if the coordinator accepted the result
+        """
+        job_id = leased["job_id"]
+        lease_seconds = leased["lease_seconds"]
+        
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job_id, lease_seconds / 3, done),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            try:
+                job = RenderJob.model_validate(leased["job"])
+                font_bytes = self._get_font(job.font_hash)
+            except OSError as e:
+                # Font download interrupted; requeue rather than failing the job for good
+                logger.warning("Fetching font for job %s failed: %s", job_id, e)
+                return self._complete(job_id, lease_seconds, None, f"Font download failed: {e}", retry=True)
+            except Exception as e:
+                return self._complete(job_id, lease_seconds, None, f"{type(e).__name__}: {e}")
+            
+            try:
+                result = generate_keychain(
+                    template_bytes=job.template_scad.encode("utf-8"),
+                    template_name=job.template_name,
+                    font_bytes=font_bytes,
+                    font_filename=job.font_filename,
+                    text=job.text,
+                    font_name=job.font_name,
+                    output_basename=job.output_basename,
+                    render_stl_file=job.render_stl,
+                    openscad_path=self.openscad_path,
+                    tessellation=job.tessellation
+                )
+                error = None
+                retry = False
+                if job.render_stl and result.stl is None:
+                    # generate_keychain reports OpenSCAD failures instead of raising.
+                    # The cause may be this worker's toolchain, so let another worker retry.
+                    error = result.stl_error or "STL rendering produced no output"
+                    result = None
+                    retry = True
+            except Exception as e:
+                result = None
+                error = f"{type(e).__name__}: {e}"
+                retry = False
+            
+            # Heartbeats continue while retrying, so the lease survives a brief outage
+            return self._complete(job_id, lease_seconds, result, error, retry)
+        finally:
+            done.set()
+            heartbeat.join()
+    
+    def _complete(
+        self,
+        job_id: str,
+        lease_seconds: float,
+        result: Optional[KeychainArtifacts],
+        error: Optional[str],
+        retry: bool = False,
+    ) -> bool:
+        """Post a job's outcome, retrying for up to one lease period if the coordinator is unreachable."""
+        deadline = time.monotonic() + lease_seconds
+        while True:
+            try:
+                return self.client.complete(job_id, self.worker_id, result=result, error=error, retry=retry)
+            except OSError as e:
+                if self._stop.is_set() or time.monotonic() >= deadline:
+                    logger.error("Giving up on reporting job %s: %s", job_id, e)
+                    return False
+                logger.warning("Reporting job %s failed, retrying: %s", job_id, e)
+                self._stop.wait(self.poll_interval)
+    
+    def _get_font(self, digest: str) -> bytes:
+        font = self._fonts.get(digest)
+        if font is None:
+            font = self.client.fetch_font(digest)
+            if font_hash(font) != digest:
+                raise ValueError(f"Font content does not match hash {digest}")
+            self._fonts[digest] = font
+        return font
+    
+    def _heartbeat_loop(self, job_id: str, interval: float, done: threading.Event) -> None:
+        while not done.wait(interval):
+            try:
+                if not self.client.heartbeat(job_id, self.worker_id):
+                    # Lease lost; the result will be rejected, but finishing is harmless
+                    return
+            except OSError:
+                # Coordinator briefly unreachable; the lease may still be valid
+                pass
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m keychain_maker.distributed",
+        description="Run a render coordinator or worker."
+    )
+    sub = parser.add_subparsers(dest="mode", required=True)
+    
+    coord = sub.add_parser("coordinator", help="Serve the job queue over HTTP")
+    coord.add_argument("--host", default="127.0.0.1")
+    coord.add_argument("--port", type=int, default=8765)
+    coord.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    coord.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    coord.add_argument("--result-ttl", type=float, default=DEFAULT_RESULT_TTL)
+    
+    work = sub.add_parser("worker", help="Pull and render jobs from a coordinator")
+    work.add_argument("--coordinator", required=True, help="Coordinator URL, e.g. http://127.0.0.1:8765")
+    work.add_argument("--worker-id", default=None)
+    work.add_argument("--openscad-path", default=None)
+    work.add_argument("--poll-interval", type=float, default=1.0)
+    work.add_argument("--max-jobs", type=int, default=None)
+    
+    args = parser.parse_args(argv)
+    
+    if args.mode == "coordinator":
+        server = serve_coordinator(
+            Coordinator(
+                lease_seconds=args.lease_seconds,
+                max_attempts=args.max_attempts,
+                result_ttl=args.result_ttl
+            ),
+            host=args.host,
+            port=args.port
+        )
+        print(f"Coordinator listening on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        worker = Worker(
+            CoordinatorClient(args.coordinator),
+            worker_id=args.worker_id,
+            openscad_path=args.openscad_path,
+            poll_interval=args.poll_interval
+        )
+        print(f"Worker {worker.worker_id} polling {args.coordinator}")
+        try:
+            worker.run(max_jobs=args.max_jobs)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
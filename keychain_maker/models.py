@@ -1,6 +1,6 @@
 # keychain_maker/models.py
 
-from pydantic import BaseModel, FilePath
+from pydantic import BaseModel, Field, FilePath, field_validator, model_validator
 from pathlib import Path
 from typing import Optional
 
@@ -25,3 +25,66 @@ class KeychainRequest(BaseModel):
     def output_stl(self) -> Path:
         """Path to the generated STL file."""
         return Path("dist") / f"{self.output_basename}.stl"
+
+class RenderProfile(BaseModel):
+    """Timings and statistics captured from one OpenSCAD render."""
+    
+    wall_time: float  # seconds from process start to exit
+    parse_time: Optional[float] = None  # seconds spent parsing the design
+    compile_time: Optional[float] = None  # seconds building the CSG tree
+    geometry_time: Optional[float] = None  # seconds for CGAL/Manifold geometry, as reported by OpenSCAD
+    export_time: Optional[float] = None  # seconds after geometry until the STL was written
+    backend: Optional[str] = None  # e.g. "CGAL" or "Manifold"
+    vertices: Optional[int] = None
+    facets: Optional[int] = None
+    volumes: Optional[int] = None
+    geometries_in_cache: Optional[int] = None
+    geometry_cache_bytes: Optional[int] = None
+    cgal_polyhedrons_in_cache: Optional[int] = None
+    cgal_cache_bytes: Optional[int] = None
+    warnings: int = 0
+    output: str = ""  # raw console output
+
+class TessellationPolicy(BaseModel):
+    """Target print resolution used to size $fn/$fa/$fs and segment counts."""
+    
+    nozzle_width: float = Field(default=0.4, gt=0)  # mm; no segment is made shorter than this
+    max_chord_error: Optional[float] = Field(default=None, gt=0)  # mm a segment may deviate from the true curve; defaults to nozzle_width / 4
+    min_segments: int = Field(default=12, ge=3)
+    max_segments: int = Field(default=128, ge=3)
+    
+    @model_validator(mode="after")
+    def _check_segment_bounds(self) -> "TessellationPolicy":
+        if self.min_segments > self.max_segments:
+            raise ValueError("min_segments must not exceed max_segments")
+        return self
+
+class KeychainArtifacts(BaseModel):
+    """Generated output for one keychain request, held in memory."""
+    
+    output_basename: str
+    scad: str  # rendered SCAD source
+    stl: Optional[bytes] = None  # None when STL rendering was skipped or failed
+    stl_error: Optional[str] = None
+    profile: Optional[RenderProfile] = None  # set when the STL rendered successfully
+
+class RenderJob(BaseModel):
+    """A render job as exchanged between coordinator and workers."""
+    
+    template_scad: str  # template source, sent inline
+    template_name: str
+    font_hash: str  # SHA-256 of the font file, fetched separately by workers
+    font_filename: str
+    text: str
+    font_name: str
+    output_basename: str
+    render_stl: bool = True
+    tessellation: Optional[TessellationPolicy] = None  # None keeps the template's own resolution
+    
+    @field_validator("template_name", "font_filename", "output_basename")
+    @classmethod
+    def _plain_filename(cls, value: str) -> str:
+        # These name files on the worker, so they must not escape its temp directory
+        if value in ("", ".", "..") or "/" in value or "\\" in value or Path(value).is_absolute():
+            raise ValueError(f"Must be a plain file name without path components: {value!r}")
+        return value
@@ -0,0 +1,148 @@
+# keychain_maker/pipeline.py
+
+import hashlib
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Optional
+from .models import KeychainRequest, KeychainArtifacts, TessellationPolicy
+from .templates import render_template
+from .scad_renderer import render_stl
+from .tessellation import overrides_for_template
+
+def artifact_key(
+    template_bytes: bytes,
+    font_bytes: bytes,
+    text: str,
+    font_name: str,
+    output_basename: str,
+    render_stl_file: bool,
+    tessellation: Optional[TessellationPolicy] = None,
+) -> str:
+    """
+    Compute a stable hash identifying one set of generation inputs.
+    
+    Two requests with the same key produce identical SCAD/STL output, so the
+    key can be used to reuse a previous render instead of running OpenSCAD again.
+    
+    Args:
+        template_bytes: Raw contents of the SCAD template
+        font_bytes: Raw contents of the font file
+        text: Keychain text
+        font_name: OpenSCAD font identifier
+        output_basename: Base name for generated files
+        render_stl_file: Whether an STL render was requested
+        tessellation: Optional adaptive tessellation policy
+        
+    Returns:
+        Hex-encoded SHA-256 digest of the inputs
+    """
+    h = hashlib.sha256()
+    for part in (
+        template_bytes,
+        font_bytes,
+        text.encode("utf-8"),
+        font_name.encode("utf-8"),
+        output_basename.encode("utf-8"),
+        b"stl" if render_stl_file else b"scad",
+        tessellation.model_dump_json().encode("utf-8") if tessellation else b"",
+    ):
+        # Length-prefix each field so adjacent values cannot run together
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+def _child_path(directory: Path, name: str) -> Path:
+    """
+    Join a file name onto a directory, refusing anything that escapes it.
+    
+    Raises:
+        ValueError: If `name` is not a plain file name
+    """
+    path = (directory / name).resolve()
+    if Path(name).name != name or path.parent != directory.resolve():
+        raise ValueError(f"Invalid file name: {name!r}")
+    return path
+
+def generate_keychain(
+    template_bytes: bytes,
+    template_name: str,
+    font_bytes: bytes,
+    font_filename: str,
+    text: str,
+    font_name: str,
+    output_basename: str,
+    render_stl_file: bool = True,
+    openscad_path: Optional[str] = None,
+    tessellation: Optional[TessellationPolicy] = None,
+) -> KeychainArtifacts:
+    """
+    Render a template and optionally an STL entirely in a temporary directory.
+    
+    Args:
+        template_bytes: Raw contents of the SCAD template
+        template_name: File name of the template
+        font_bytes: Raw contents of the font file
+        font_filename: File name of the font (referenced by the template's `use <>`)
+        text: Keychain text
+        font_name: OpenSCAD font identifier
+        output_basename: Base name for generated files (without extension)
+        render_stl_file: Whether to run OpenSCAD to produce an STL
+        openscad_path: Optional custom path to OpenSCAD executable
+        tessellation: Optional policy sizing $fn/$fa/$fs and segment counts to
+            the text size and print resolution; None keeps the template's values
+        
+    Returns:
+        KeychainArtifacts holding the generated file contents. STL failures are
+        reported through `stl_error` rather than raised, so the SCAD output is
+        still available.
+        
+    Raises:
+        ValueError: If a file name contains path components
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        
+        template_path = _child_path(tmpdir_path, template_name)
+        font_path = _child_path(tmpdir_path, font_filename)
+        template_path.write_bytes(template_bytes)
+        font_path.write_bytes(font_bytes)
+        
+        # Output directory holds the .scad beside its font, as OpenSCAD expects
+        output_dir = tmpdir_path / "dist"
+        output_dir.mkdir(exist_ok=True)
+        _child_path(output_dir, font_filename).write_bytes(font_bytes)
+        
+        req = KeychainRequest(
+            template_scad=template_path,
+            font_file=font_path,
+            text=text,
+            font_name=font_name,
+            output_basename=output_basename
+        )
+        
+        rendered = render_template(req)
+        scad_output_path = _child_path(output_dir, f"{output_basename}.scad")
+        scad_output_path.write_text(rendered, encoding="utf-8")
+        
+        artifacts = KeychainArtifacts(
+            output_basename=output_basename,
+            scad=rendered,
+        )
+        
+        if render_stl_file:
+            stl_output_path = _child_path(output_dir, f"{output_basename}.stl")
+            try:
+                artifacts.profile = render_stl(
+                    scad_file_path=str(scad_output_path),
+                    stl_file_path=str(stl_output_path),
+                    openscad_path=openscad_path,
+                    overrides=overrides_for_template(tessellation, rendered)
+                )
+                artifacts.stl = stl_output_path.read_bytes()
+            except subprocess.CalledProcessError as e:
+                artifacts.stl_error = f"STL rendering failed: {e.stderr}"
+            except Exception as e:
+                artifacts.stl_error = f"STL rendering error: {str(e)}"
+        
+        return artifacts
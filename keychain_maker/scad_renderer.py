@@ -4,9 +4,30 @@ import subprocess
 import shutil
 import os
 import platform
+import re
+import time
 from pathlib import Path
-from typing import Optional
-from .models import KeychainRequest
+from typing import Dict, List, Optional, Tuple, Union
+from .models import KeychainRequest, RenderProfile
+
+# Stage announcements OpenSCAD prints as it works through a render
+_STAGE_PARSE = "Parsing design"
+_STAGE_COMPILE = "Compiling design"
+_STAGE_RENDER = "Rendering Polygon Mesh"
+
+# "Label: <integer>" statistics lines, mapped to RenderProfile fields
+_INT_STATS = {
+    "Vertices": "vertices",
+    "Facets": "facets",
+    "Volumes": "volumes",
+    "Geometries in cache": "geometries_in_cache",
+    "Geometry cache size in bytes": "geometry_cache_bytes",
+    "CGAL Polyhedrons in cache": "cgal_polyhedrons_in_cache",
+    "CGAL cache size in bytes": "cgal_cache_bytes",
+}
+_INT_STAT_RE = re.compile(r"^\s*([A-Za-z][A-Za-z ]*?):\s*(\d+)\s*$")
+_BACKEND_RE = re.compile(r"Rendering Polygon Mesh using (\w+)")
+_TOTAL_TIME_RE = re.compile(r"Total rendering time:\s*(.+?)\s*$")
 
 def get_openscad_path() -> Optional[str]:
     """
@@ -105,7 +126,13 @@ def get_openscad_version(openscad_path: str) -> Optional[str]:
     except Exception:
         return None
 
-def render_stl(scad_file_path: str, stl_file_path: str, openscad_path: Optional[str] = None) -> None:
+def render_stl(
+    scad_file_path: str,
+    stl_file_path: str,
+    openscad_path: Optional[str] = None,
+    profile_path: Optional[str] = None,
+    overrides: Optional[Dict[str, Union[int, float, str]]] = None,
+) -> RenderProfile:
     """
     Run OpenSCAD CLI to generate an STL from a SCAD file.
     
@@ -113,6 +140,11 @@ def render_stl(scad_file_path: str, stl_file_path: str, openscad_path: Optional[
         scad_file_path: Path to input SCAD file
         stl_file_path: Path to output STL file
         openscad_path: Optional custom path to OpenSCAD executable
+        profile_path: Optional path to write the render profile as JSON
+        overrides: Optional top-level variable overrides, passed as `-D name=value`
+        
+    Returns:
+        RenderProfile with stage timings and geometry/cache statistics
         
     Raises:
         FileNotFoundError: If OpenSCAD is not installed
@@ -127,20 +159,115 @@ def render_stl(scad_file_path: str, stl_file_path: str, openscad_path: Optional[
             "OpenSCAD CLI not found. Please install OpenSCAD or set the OPENSCAD_PATH environment variable."
         )
     
-    cmd = [
-        openscad_path,
+    cmd = [openscad_path]
+    for name, value in (overrides or {}).items():
+        cmd += ["-D", f"{name}={value}"]
+    cmd += [
         "-o",
         str(stl_file_path),
         str(scad_file_path),
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Stream the console output so each line can be timestamped for stage timings
+    start = time.perf_counter()
+    lines = []
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    ) as proc:
+        for line in proc.stdout:
+            lines.append((time.perf_counter() - start, line.rstrip("\n")))
+        returncode = proc.wait()
+    wall_time = time.perf_counter() - start
     
-    if result.returncode != 0:
-        error_msg = result.stderr or result.stdout or "Unknown error"
+    output = "\n".join(line for _, line in lines)
+    if returncode != 0:
         raise subprocess.CalledProcessError(
-            result.returncode,
+            returncode,
             cmd,
-            output=result.stdout,
-            stderr=error_msg
+            output=output,
+            stderr=output or "Unknown error"
         )
+    
+    profile = parse_openscad_output(lines, wall_time)
+    if profile_path is not None:
+        Path(profile_path).write_text(profile.model_dump_json(indent=2), encoding="utf-8")
+    return profile
+
+def _parse_duration(value: str) -> Optional[float]:
+    """
+    Convert an OpenSCAD duration to seconds.
+    
+    Handles both "0:00:01.224" and the older "0 hours, 0 minutes, 1 seconds" formats.
+    """
+    parts = value.split(":")
+    if len(parts) == 3:
+        try:
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
+        except ValueError:
+            return None
+    
+    units = {"hour": 3600, "minute": 60, "second": 1}
+    matches = re.findall(r"(\d+(?:\.\d+)?)\s*(hour|minute|second)", value)
+    if not matches:
+        return None
+    return sum(float(amount) * units[unit] for amount, unit in matches)
+
+def parse_openscad_output(lines: List[Tuple[float, str]], wall_time: float) -> RenderProfile:
+    """
+    Build a RenderProfile from OpenSCAD console output.
+    
+    Stage durations are derived from when OpenSCAD announced each stage, so
+    they are only as precise as its output flushing. The geometry time uses
+    OpenSCAD's own "Total rendering time" when present.
+    
+    Args:
+        lines: (seconds since process start, line) pairs, in output order
+        wall_time: Seconds from process start to exit
+        
+    Returns:
+        RenderProfile with every statistic that could be found
+    """
+    profile = RenderProfile(wall_time=wall_time, output="\n".join(line for _, line in lines))
+    stage_start = {}
+    stats_end = None  # last line reported before the STL export begins
+    
+    for t, line in lines:
+        for stage in (_STAGE_PARSE, _STAGE_COMPILE, _STAGE_RENDER):
+            if line.startswith(stage):
+                stage_start.setdefault(stage, t)
+        
+        if line.startswith("WARNING:"):
+            profile.warnings += 1
+        
+        backend = _BACKEND_RE.search(line)
+        if backend:
+            profile.backend = backend.group(1)
+        
+        total = _TOTAL_TIME_RE.search(line)
+        if total:
+            profile.geometry_time = _parse_duration(total.group(1))
+            stats_end = t
+            continue
+        
+        stat = _INT_STAT_RE.match(line)
+        if stat and stat.group(1) in _INT_STATS:
+            setattr(profile, _INT_STATS[stat.group(1)], int(stat.group(2)))
+            stats_end = t
+    
+    parse_start = stage_start.get(_STAGE_PARSE, 0.0)
+    compile_start = stage_start.get(_STAGE_COMPILE)
+    render_start = stage_start.get(_STAGE_RENDER)
+    
+    if compile_start is not None:
+        profile.parse_time = compile_start - parse_start
+        if render_start is not None:
+            profile.compile_time = render_start - compile_start
+    if profile.geometry_time is None and render_start is not None and stats_end is not None:
+        profile.geometry_time = stats_end - render_start
+    if stats_end is not None:
+        profile.export_time = max(wall_time - stats_end, 0.0)
+    
+    return profile
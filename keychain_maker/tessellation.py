@@ -0,0 +1,91 @@
+# keychain_maker/tessellation.py
+
+import math
+import re
+from typing import Dict, Optional, Union
+from .models import TessellationPolicy
+
+# Fallbacks matching the example templates
+DEFAULT_TEXT_SIZE = 15.0
+RING_DIAMETER = 8.0
+
+_TEXT_SIZE_RE = re.compile(r"^\s*Text_Size\s*=\s*(\d+(?:\.\d+)?)\s*;", re.MULTILINE)
+
+def fragments_for_radius(radius: float, policy: TessellationPolicy) -> int:
+    """
+    Number of segments needed to approximate a circle at the policy's resolution.
+    
+    Uses the fewest segments that keep the chord error within max_chord_error,
+    and never makes a segment shorter than the nozzle width.
+    
+    Args:
+        radius: Circle radius in mm
+        policy: Target print resolution
+        
+    Returns:
+        Segment count clamped to [min_segments, max_segments]
+    """
+    if radius <= 0:
+        return policy.min_segments
+    
+    chord_error = policy.max_chord_error
+    if chord_error is None:
+        chord_error = policy.nozzle_width / 4
+    
+    if chord_error >= radius:
+        segments = policy.min_segments
+    else:
+        # Sagitta of a chord spanning angle a is r * (1 - cos(a / 2))
+        segments = math.ceil(math.pi / math.acos(1 - chord_error / radius))
+        segments = min(segments, math.floor(2 * math.pi * radius / policy.nozzle_width))
+    
+    return max(policy.min_segments, min(segments, policy.max_segments))
+
+def detect_text_size(scad_text: str) -> float:
+    """Read the `Text_Size` assignment from a template, falling back to the default."""
+    match = _TEXT_SIZE_RE.search(scad_text)
+    return float(match.group(1)) if match else DEFAULT_TEXT_SIZE
+
+def offset_radius(text_size: float) -> float:
+    """Rounding radius of the base outline, as computed by the example templates."""
+    # OpenSCAD's round() rounds halves away from zero, unlike Python's
+    return float(math.floor((text_size + 10) / 10 + 0.5))
+
+def tessellation_overrides(
+    policy: TessellationPolicy,
+    text_size: float,
+    ring_diameter: float = RING_DIAMETER,
+) -> Dict[str, Union[int, float]]:
+    """
+    Compute OpenSCAD variable overrides for a keychain at the given size.
+    
+    `text_fn`, `offset_fn` and `cyl_segments` are the per-feature variables the
+    example templates use for the text, the rounded base outline and the key
+    ring. Global `$fa`/`$fs` are left alone, so other curved geometry keeps
+    OpenSCAD's defaults.
+    
+    OpenSCAD subdivides each glyph curve into roughly $fn / 8 steps of a circle
+    whose radius is the text size, so the text is sized on that radius.
+    
+    Args:
+        policy: Target print resolution
+        text_size: Text size in mm (the template's `Text_Size`)
+        ring_diameter: Outer diameter of the key ring in mm
+        
+    Returns:
+        Mapping of OpenSCAD variable name to value
+    """
+    return {
+        "text_fn": fragments_for_radius(text_size, policy),
+        "offset_fn": fragments_for_radius(offset_radius(text_size), policy),
+        "cyl_segments": fragments_for_radius(ring_diameter / 2, policy),
+    }
+
+def overrides_for_template(
+    policy: Optional[TessellationPolicy],
+    scad_text: str,
+) -> Dict[str, Union[int, float]]:
+    """Overrides for a rendered template, or none if no policy is given."""
+    if policy is None:
+        return {}
+    return tessellation_overrides(policy, detect_text_size(scad_text))
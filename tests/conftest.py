@@ -0,0 +1,50 @@
+# tests/conftest.py
+
+import sys
+from typing import List
+
+import pytest
+
+STUB_TEMPLATE = """#!{python}
+import sys
+args = sys.argv[1:]
+out = args[args.index("-o") + 1]
+for line in {stdout!r}:
+    print(line, flush=True)
+for line in {lines!r}:
+    print(line, file=sys.stderr, flush=True)
+if {exit_code}:
+    sys.exit({exit_code})
+with open(out, "w") as f:
+    f.write("solid stub\\nendsolid stub\\n")
+"""
+
+DEFAULT_STUB_OUTPUT = [
+    "Parsing design (AST generation)...",
+    "Compiling design (CSG Tree generation)...",
+    "Rendering Polygon Mesh using CGAL...",
+    "Total rendering time: 0:00:00.010",
+    "   Facets:        42",
+]
+
+@pytest.fixture
+def make_openscad_stub(tmp_path):
+    """Factory for fake OpenSCAD executables that print given lines (to stderr, and optionally stdout) and exit with a given code."""
+    counter = [0]
+    
+    def make(lines: List[str] = DEFAULT_STUB_OUTPUT, exit_code: int = 0, stdout: List[str] = ()) -> str:
+        counter[0] += 1
+        path = tmp_path / f"openscad-{counter[0]}"
+        path.write_text(STUB_TEMPLATE.format(python=sys.executable, lines=list(lines), exit_code=exit_code, stdout=list(stdout)))
+        path.chmod(0o755)
+        return str(path)
+    
+    return make
+
+@pytest.fixture
+def stub_openscad(make_openscad_stub):
+    return make_openscad_stub()
+
+@pytest.fixture
+def failing_openscad(make_openscad_stub):
+    return make_openscad_stub(["ERROR: Parser error in file x.scad, line 3"], exit_code=1)
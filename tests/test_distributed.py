@@ -0,0 +1,220 @@
+# tests/test_distributed.py
+
+import http.client
+import threading
+from pathlib import Path
+
+import pytest
+
+from keychain_maker.distributed import (
+    DONE,
+    FAILED,
+    Coordinator,
+    CoordinatorClient,
+    Worker,
+    serve_coordinator,
+)
+from keychain_maker.models import RenderJob
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "examples" / "barbie_keychain.scad"
+
+@pytest.fixture
+def coordinator():
+    coord = Coordinator(lease_seconds=0.5)
+    server = serve_coordinator(coord, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield coord, CoordinatorClient(f"http://127.0.0.1:{server.server_address[1]}", timeout=5)
+    server.shutdown()
+    server.server_close()
+
+def make_job(font_hash: str, text: str) -> RenderJob:
+    return RenderJob(
+        template_scad=TEMPLATE.read_text(encoding="utf-8"),
+        template_name=TEMPLATE.name,
+        font_hash=font_hash,
+        font_filename="font.ttf",
+        text=text,
+        font_name="Test:style=Regular",
+        output_basename=text.lower(),
+    )
+
+def run_workers(workers):
+    threads = [threading.Thread(target=w.run, daemon=True) for w in workers]
+    for t in threads:
+        t.start()
+    return threads
+
+def stop_workers(workers, threads):
+    for w in workers:
+        w.stop()
+    for t in threads:
+        t.join(timeout=5)
+
+def test_workers_complete_jobs_and_requeue_abandoned_lease(coordinator, stub_openscad):
+    coord, client = coordinator
+    font_hash = client.upload_font(b"not really a font")
+    job_ids = [client.submit(make_job(font_hash, f"Name{i}")) for i in range(6)]
+    
+    # A worker that leases a job and then dies without heartbeating
+    abandoned = client.lease("dead-worker")
+    assert abandoned is not None
+    
+    workers = [
+        Worker(client, worker_id=f"w{i}", openscad_path=stub_openscad, poll_interval=0.05)
+        for i in range(2)
+    ]
+    threads = run_workers(workers)
+    try:
+        for job_id in job_ids:
+            status = client.wait(job_id, poll_interval=0.05, timeout=30)
+            assert status["state"] == DONE, status
+            result = client.result(job_id)
+            assert result.stl.startswith(b"solid")
+            assert result.profile.facets == 42
+    finally:
+        stop_workers(workers, threads)
+    
+    requeued = client.status(abandoned["job_id"])
+    assert requeued["attempts"] == 2
+    assert requeued["worker_id"] in ("w0", "w1")
+    
+    # The dead worker's late report must not overwrite the real result
+    assert client.complete(abandoned["job_id"], "dead-worker", error="late") is False
+    assert client.status(abandoned["job_id"])["state"] == DONE
+    
+    assert client.discard(abandoned["job_id"]) is True
+    assert coord.counts()[DONE] == len(job_ids) - 1
+
+def test_failed_openscad_render_is_not_reported_done(coordinator, failing_openscad):
+    coord, client = coordinator
+    font_hash = client.upload_font(b"not really a font")
+    job_ids = [client.submit(make_job(font_hash, f"Name{i}")) for i in range(3)]
+    
+    workers = [Worker(client, worker_id="broken", openscad_path=failing_openscad, poll_interval=0.05)]
+    threads = run_workers(workers)
+    try:
+        for job_id in job_ids:
+            status = client.wait(job_id, poll_interval=0.05, timeout=30)
+            assert status["state"] == FAILED, status
+            assert status["attempts"] == coord.max_attempts
+            assert "Parser error" in status["error"]
+            assert client.result(job_id) is None
+    finally:
+        stop_workers(workers, threads)
+    
+    assert coord.counts()[DONE] == 0
+
+def test_failed_render_is_retried_by_healthy_worker(failing_openscad, stub_openscad):
+    coord = Coordinator()
+    job_id = coord.submit(make_job(coord.add_font(b"font"), "Retry"))
+    client = _LocalClient(coord)
+    
+    broken = Worker(client, worker_id="broken", openscad_path=failing_openscad)
+    assert broken.process(coord.lease("broken")) is True
+    assert coord.status(job_id)["state"] == "queued"
+    
+    healthy = Worker(client, worker_id="healthy", openscad_path=stub_openscad)
+    assert healthy.process(coord.lease("healthy")) is True
+    status = coord.status(job_id)
+    assert status["state"] == DONE
+    assert status["attempts"] == 2
+
+class _LocalClient:
+    """Routes Worker calls straight to a Coordinator, without HTTP."""
+    
+    def __init__(self, coord):
+        self.coord = coord
+    
+    def fetch_font(self, digest):
+        return self.coord.get_font(digest)
+    
+    def heartbeat(self, job_id, worker_id):
+        return self.coord.heartbeat(job_id, worker_id)
+    
+    def complete(self, job_id, worker_id, result=None, error=None, retry=False):
+        return self.coord.complete(job_id, worker_id, result=result, error=error, retry=retry)
+
+def test_interrupted_font_download_requeues_job(stub_openscad):
+    coord = Coordinator()
+    job_id = coord.submit(make_job(coord.add_font(b"font"), "Flaky"))
+    client = _LocalClient(coord)
+    real_fetch = client.fetch_font
+    calls = []
+    
+    def flaky_fetch(digest):
+        calls.append(digest)
+        if len(calls) == 1:
+            raise ConnectionResetError("connection reset by peer")
+        return real_fetch(digest)
+    
+    client.fetch_font = flaky_fetch
+    worker = Worker(client, worker_id="w", openscad_path=stub_openscad)
+    
+    assert worker.process(coord.lease("w")) is True
+    assert coord.status(job_id)["state"] == "queued"
+    
+    assert worker.process(coord.lease("w")) is True
+    assert coord.status(job_id)["state"] == DONE
+    assert len(calls) == 2
+
+@pytest.mark.parametrize("path,body,headers", [
+    ("/lease", b"[]", {}),
+    ("/lease", b"{}", {}),
+    ("/lease", b"not json", {}),
+    ("/jobs/abc/complete", b'{"worker_id": "w", "result": []}', {}),
+    ("/jobs", b'{"template_name": "x"}', {}),
+    ("/lease", b"{}", {"Content-Length": "abc"}),
+    ("/lease", b"{}", {"Content-Length": "-1"}),
+])
+def test_malformed_requests_get_400(coordinator, path, body, headers):
+    _, client = coordinator
+    host, port = client.base_url.rsplit("/", 1)[1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        conn.putrequest("POST", path)
+        conn.putheader("Content-Length", headers.get("Content-Length", str(len(body))))
+        conn.endheaders()
+        conn.send(body)
+        assert conn.getresponse().status == 400
+    finally:
+        conn.close()
+
+def test_lease_expiry_gives_up_after_max_attempts():
+    now = [0.0]
+    coord = Coordinator(lease_seconds=10, max_attempts=2, clock=lambda: now[0])
+    job_id = coord.submit(make_job(coord.add_font(b"font"), "Retry"))
+    
+    assert coord.lease("a")["job_id"] == job_id
+    now[0] = 11
+    assert coord.lease("b")["job_id"] == job_id
+    assert coord.complete(job_id, "a") is False
+    now[0] = 22
+    
+    assert coord.lease("c") is None
+    assert coord.status(job_id)["state"] == FAILED
+
+def test_finished_results_expire_after_ttl():
+    now = [0.0]
+    coord = Coordinator(result_ttl=60, clock=lambda: now[0])
+    job_id = coord.submit(make_job(coord.add_font(b"font"), "Expire"))
+    coord.lease("a")
+    assert coord.complete(job_id, "a", error="boom") is True
+    
+    now[0] = 59
+    assert coord.status(job_id)["state"] == FAILED
+    now[0] = 60
+    assert coord.status(job_id) is None
+
+@pytest.mark.parametrize("name", ["/tmp/evil.scad", "../evil.scad", "..", "a/b.scad", "a\\b.scad"])
+def test_render_job_rejects_path_names(name):
+    with pytest.raises(ValueError):
+        RenderJob(
+            template_scad="",
+            template_name=name,
+            font_hash="0" * 64,
+            font_filename="font.ttf",
+            text="x",
+            font_name="x",
+            output_basename="x",
+        )
@@ -0,0 +1,90 @@
+# tests/test_pipeline.py
+
+from pathlib import Path
+
+import pytest
+
+from keychain_maker.models import TessellationPolicy
+from keychain_maker.pipeline import _child_path, artifact_key, generate_keychain
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "examples" / "barbie_keychain.scad"
+
+BASE_INPUTS = dict(
+    template_bytes=b"Text=\"{{TEXT}}\";",
+    font_bytes=b"font",
+    text="Alice",
+    font_name="Test:style=Regular",
+    output_basename="alice",
+    render_stl_file=True,
+    tessellation=None,
+)
+
+@pytest.mark.parametrize("field,value", [
+    ("template_bytes", b"Text=\"{{TEXT}}\"; // changed"),
+    ("font_bytes", b"other font"),
+    ("text", "Bob"),
+    ("font_name", "Other:style=Bold"),
+    ("output_basename", "bob"),
+    ("render_stl_file", False),
+    ("tessellation", TessellationPolicy()),
+])
+def test_artifact_key_changes_with_every_input(field, value):
+    changed = dict(BASE_INPUTS, **{field: value})
+    assert artifact_key(**changed) != artifact_key(**BASE_INPUTS)
+
+def test_artifact_key_distinguishes_tessellation_policies():
+    coarse = dict(BASE_INPUTS, tessellation=TessellationPolicy(nozzle_width=0.6))
+    fine = dict(BASE_INPUTS, tessellation=TessellationPolicy(nozzle_width=0.25))
+    assert artifact_key(**coarse) != artifact_key(**fine)
+
+def test_artifact_key_is_stable():
+    assert artifact_key(**BASE_INPUTS) == artifact_key(**dict(BASE_INPUTS))
+
+def test_artifact_key_fields_cannot_run_together():
+    a = dict(BASE_INPUTS, text="ab", font_name="c")
+    b = dict(BASE_INPUTS, text="a", font_name="bc")
+    assert artifact_key(**a) != artifact_key(**b)
+
+def generate(openscad_path, **overrides):
+    kwargs = dict(
+        template_bytes=TEMPLATE.read_bytes(),
+        template_name=TEMPLATE.name,
+        font_bytes=b"font",
+        font_filename="font.ttf",
+        text="Alice",
+        font_name="Test:style=Regular",
+        output_basename="alice",
+        render_stl_file=True,
+        openscad_path=openscad_path,
+    )
+    kwargs.update(overrides)
+    return generate_keychain(**kwargs)
+
+def test_generate_keychain_renders_scad_and_stl(stub_openscad):
+    artifacts = generate(stub_openscad)
+    assert 'Text="Alice";' in artifacts.scad
+    assert 'use <font.ttf>' in artifacts.scad
+    assert artifacts.stl.startswith(b"solid")
+    assert artifacts.stl_error is None
+    assert artifacts.profile is not None
+
+def test_generate_keychain_reports_stl_failure(failing_openscad):
+    artifacts = generate(failing_openscad)
+    assert artifacts.stl is None
+    assert artifacts.profile is None
+    assert "Parser error" in artifacts.stl_error
+    # The SCAD output is still returned
+    assert 'Text="Alice";' in artifacts.scad
+
+def test_generate_keychain_skips_stl_when_not_requested(failing_openscad):
+    artifacts = generate(failing_openscad, render_stl_file=False)
+    assert artifacts.stl is None
+    assert artifacts.stl_error is None
+
+@pytest.mark.parametrize("name", ["../x", "/tmp/x", "a/../../x"])
+def test_child_path_rejects_escaping_names(tmp_path, name):
+    with pytest.raises(ValueError):
+        _child_path(tmp_path, name)
+
+def test_child_path_accepts_plain_name(tmp_path):
+    assert _child_path(tmp_path, "keychain.scad") == (tmp_path / "keychain.scad").resolve()
@@ -0,0 +1,132 @@
+# tests/test_scad_renderer.py
+
+import json
+import subprocess
+
+import pytest
+
+from keychain_maker.scad_renderer import _parse_duration, parse_openscad_output, render_stl
+
+# OpenSCAD 2021.01 with CGAL; this version prints no "Parsing design" line
+CGAL_2021_LOG = [
+    (0.05, "Compiling design (CSG Tree generation)..."),
+    (0.20, "Rendering Polygon Mesh using CGAL..."),
+    (1.40, "Geometries in cache: 6"),
+    (1.40, "Geometry cache size in bytes: 54728"),
+    (1.40, "CGAL Polyhedrons in cache: 2"),
+    (1.40, "CGAL cache size in bytes: 1264424"),
+    (1.40, "Total rendering time: 0:00:01.234"),
+    (1.40, "Top level object is a 3D object:"),
+    (1.40, "   Simple:        yes"),
+    (1.40, "   Vertices:      378"),
+    (1.40, "   Halfedges:    2208"),
+    (1.40, "   Edges:        1104"),
+    (1.40, "   Halffacets:    740"),
+    (1.40, "   Facets:        370"),
+    (1.40, "   Volumes:         2"),
+    (1.50, "Rendering finished."),
+]
+
+# Newer build with the Manifold backend and the older duration format
+MANIFOLD_LOG = [
+    (0.00, "Parsing design (AST generation)..."),
+    (0.10, "Compiling design (CSG Tree generation)..."),
+    (0.15, "WARNING: Ignoring unknown variable 'foo' in file keychain.scad, line 3"),
+    (0.30, "Rendering Polygon Mesh using Manifold..."),
+    (1.30, "Geometries in cache: 3"),
+    (1.30, "Geometry cache size in bytes: 41680"),
+    (1.30, "CGAL Polyhedrons in cache: 0"),
+    (1.30, "CGAL cache size in bytes: 0"),
+    (1.30, "Total rendering time: 0 hours, 0 minutes, 1 seconds"),
+    (1.31, "Top level object is a 3D object (manifold):"),
+    (1.31, "Status:     NoError"),
+    (1.31, "Genus:      0"),
+    (1.32, "Vertices:   1322"),
+    (1.32, "Facets:     2640"),
+    (1.40, "WARNING: Object may not be a valid 2-manifold"),
+]
+
+def test_parse_cgal_2021_log():
+    profile = parse_openscad_output(CGAL_2021_LOG, wall_time=2.0)
+    
+    assert profile.backend == "CGAL"
+    assert profile.geometry_time == pytest.approx(1.234)
+    assert profile.vertices == 378
+    assert profile.facets == 370
+    assert profile.volumes == 2
+    assert profile.geometries_in_cache == 6
+    assert profile.geometry_cache_bytes == 54728
+    assert profile.cgal_polyhedrons_in_cache == 2
+    assert profile.cgal_cache_bytes == 1264424
+    assert profile.warnings == 0
+    # Without a "Parsing design" line, parsing is timed from process start
+    assert profile.parse_time == pytest.approx(0.05)
+    assert profile.compile_time == pytest.approx(0.15)
+    assert profile.export_time == pytest.approx(0.6)
+    assert "Rendering finished." in profile.output
+
+def test_parse_manifold_log():
+    profile = parse_openscad_output(MANIFOLD_LOG, wall_time=1.5)
+    
+    assert profile.backend == "Manifold"
+    assert profile.geometry_time == pytest.approx(1.0)
+    assert profile.vertices == 1322
+    assert profile.facets == 2640
+    assert profile.volumes is None
+    assert profile.geometries_in_cache == 3
+    assert profile.cgal_cache_bytes == 0
+    assert profile.warnings == 2
+    assert profile.parse_time == pytest.approx(0.1)
+    assert profile.compile_time == pytest.approx(0.2)
+    assert profile.export_time == pytest.approx(0.18)
+
+def test_parse_output_without_statistics():
+    profile = parse_openscad_output([(0.0, "Parsing design (AST generation)...")], wall_time=0.3)
+    assert profile.wall_time == 0.3
+    assert profile.parse_time is None
+    assert profile.geometry_time is None
+    assert profile.export_time is None
+    assert profile.facets is None
+
+@pytest.mark.parametrize("value,seconds", [
+    ("0:00:01.234", 1.234),
+    ("1:02:03.5", 3723.5),
+    ("0 hours, 0 minutes, 1 seconds", 1.0),
+    ("1 hours, 2 minutes, 3 seconds", 3723.0),
+])
+def test_parse_duration(value, seconds):
+    assert _parse_duration(value) == pytest.approx(seconds)
+
+@pytest.mark.parametrize("value", ["", "soon", "a:b:c"])
+def test_parse_duration_rejects_unknown_formats(value):
+    assert _parse_duration(value) is None
+
+def test_render_stl_returns_profile_and_writes_json(tmp_path, make_openscad_stub):
+    openscad = make_openscad_stub([line for _, line in MANIFOLD_LOG])
+    stl_path = tmp_path / "out.stl"
+    profile_path = tmp_path / "out.profile.json"
+    
+    profile = render_stl(str(tmp_path / "in.scad"), str(stl_path), openscad_path=openscad, profile_path=str(profile_path))
+    
+    assert stl_path.read_text().startswith("solid")
+    assert profile.backend == "Manifold"
+    assert profile.facets == 2640
+    assert profile.wall_time > 0
+    assert json.loads(profile_path.read_text())["facets"] == 2640
+
+def test_render_stl_failure_raises_with_merged_output(tmp_path, make_openscad_stub):
+    openscad = make_openscad_stub(
+        ["ERROR: Parser error in file in.scad, line 3"],
+        exit_code=1,
+        stdout=["ECHO: \"from stdout\""]
+    )
+    
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        render_stl(str(tmp_path / "in.scad"), str(tmp_path / "out.stl"), openscad_path=openscad)
+    
+    err = exc_info.value
+    assert err.returncode == 1
+    assert "Parser error" in err.stderr
+    assert "from stdout" in err.stderr
+    assert err.output == err.stderr
+    assert not (tmp_path / "out.stl").exists()
@@ -0,0 +1,35 @@
+# tests/test_tessellation.py
+
+import pytest
+
+from keychain_maker.models import TessellationPolicy
+from keychain_maker.tessellation import fragments_for_radius, tessellation_overrides
+
+@pytest.mark.parametrize("kwargs", [
+    {"nozzle_width": 0},
+    {"nozzle_width": -0.4},
+    {"max_chord_error": 0},
+    {"min_segments": 2},
+    {"max_segments": 2},
+    {"min_segments": 64, "max_segments": 32},
+])
+def test_policy_rejects_invalid_values(kwargs):
+    with pytest.raises(ValueError):
+        TessellationPolicy(**kwargs)
+
+def test_segments_grow_with_feature_size():
+    policy = TessellationPolicy()
+    small = tessellation_overrides(policy, text_size=10)
+    large = tessellation_overrides(policy, text_size=50)
+    assert small["text_fn"] < large["text_fn"]
+    assert small["offset_fn"] < large["offset_fn"]
+    assert small["cyl_segments"] == large["cyl_segments"]
+
+def test_outline_stays_coarse_for_default_text_size():
+    # Offset radius 3 at a 0.1 mm chord error needs 13 segments
+    assert tessellation_overrides(TessellationPolicy(), text_size=15)["offset_fn"] == 13
+
+def test_fragments_are_clamped():
+    policy = TessellationPolicy(min_segments=16, max_segments=24)
+    assert fragments_for_radius(0.5, policy) == 16
+    assert fragments_for_radius(500, policy) == 24